@@ -1,12 +1,18 @@
+import asyncio
+import hashlib
+import io
+import json
 import os
 import tempfile
 import shutil
 import logging
 from datetime import datetime
-from flask import Flask, request, jsonify, send_file
+from typing import Any, Dict
+from quart import Quart, request, jsonify, send_file
+from cachetools import LRUCache
 from dotenv import load_dotenv
 from google.cloud import storage
-from main import Resume
+from main import CLIENT, Resume, warm_up
 
 # Load environment variables
 load_dotenv()
@@ -18,12 +24,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+app = Quart(__name__)
 
 # Configuration from environment variables
 GCS_BUCKET_NAME = os.getenv('GCS_BUCKET_NAME')
 AUTH_KEY = os.getenv('AUTH_KEY', '')
 
+# Blob the generated resume is uploaded to (replaced on every upload)
+DEFAULT_BLOB_NAME = 'resume.pdf'
+
+# PDFs waiting to be uploaded, keyed by blob name
+PENDING_UPLOADS: Dict[str, bytes] = {}
+UPLOAD_LOCK = asyncio.Lock()
+
+# Compiled PDFs keyed by a hash of the resume data
+PDF_CACHE: LRUCache = LRUCache(maxsize=64)
+
+# Keep intermediate LaTeX files in RAM-backed tmpfs when available (Linux)
+TMP_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
 # Initialize GCS client (only if bucket name is configured)
 storage_client = None
 if GCS_BUCKET_NAME:
@@ -34,12 +53,18 @@ if GCS_BUCKET_NAME:
         logger.error(f"Failed to initialize GCS client: {str(e)}")
 
 
-def upload_to_gcs(file_path: str, destination_blob_name: str = None) -> str:
+def pdf_cache_key(data: Dict[str, Any]) -> str:
+    """Return a content hash of the resume data, used as the PDF cache key"""
+    serialized = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def upload_to_gcs(pdf_bytes: bytes, destination_blob_name: str = None) -> str:
     """
-    Upload a file to Google Cloud Storage bucket
+    Upload a PDF to Google Cloud Storage bucket
 
     Args:
-        file_path: Local path to the file
+        pdf_bytes: Contents of the PDF
         destination_blob_name: Name for the blob in GCS (optional, defaults to timestamped filename)
 
     Returns:
@@ -52,14 +77,15 @@ def upload_to_gcs(file_path: str, destination_blob_name: str = None) -> str:
     try:
         # Generate destination blob name if not provided
         if not destination_blob_name:
-            destination_blob_name = "resume.pdf"
+            destination_blob_name = DEFAULT_BLOB_NAME
 
         # Get bucket and create blob
         bucket = storage_client.bucket(GCS_BUCKET_NAME)
         blob = bucket.blob(destination_blob_name)
 
-        # Upload file (will replace if exists)
-        blob.upload_from_filename(file_path)
+        # Upload from memory (will replace if exists). With the size known up front
+        # a small PDF goes out as a single multipart request, no resumable session
+        blob.upload_from_string(pdf_bytes, content_type='application/pdf')
 
         # Log the upload event
         logger.info(f"File uploaded successfully to gs://{GCS_BUCKET_NAME}/{destination_blob_name}")
@@ -71,15 +97,82 @@ def upload_to_gcs(file_path: str, destination_blob_name: str = None) -> str:
         raise
 
 
+def queue_gcs_upload(pdf_bytes: bytes, destination_blob_name: str) -> None:
+    """
+    Queue a PDF for background upload to GCS
+
+    A PDF still waiting for the same blob is superseded, so a burst of
+    requests results in a single upload of the newest resume.
+
+    Args:
+        pdf_bytes: Contents of the PDF
+        destination_blob_name: Name for the blob in GCS
+    """
+    already_queued = destination_blob_name in PENDING_UPLOADS
+    PENDING_UPLOADS[destination_blob_name] = pdf_bytes
+    if not already_queued:
+        app.add_background_task(flush_gcs_upload, destination_blob_name)
+
+
+async def flush_gcs_upload(destination_blob_name: str) -> None:
+    """Upload the newest queued PDF for a blob"""
+    # Uploads run one at a time, reusing the storage client's kept-alive connection
+    async with UPLOAD_LOCK:
+        pdf_bytes = PENDING_UPLOADS.pop(destination_blob_name, None)
+        if pdf_bytes is None:
+            return
+
+        await asyncio.to_thread(upload_to_gcs, pdf_bytes, destination_blob_name)
+
+
+@app.before_serving
+async def warm_latex():
+    """Compile a throwaway resume so the first request finds the TeX tree in the page cache"""
+    tmpdir = tempfile.mkdtemp(dir=TMP_ROOT)
+    try:
+        # A compile failure here would fail every request, so refuse to start instead
+        await warm_up(tmpdir)
+        logger.info("LaTeX warm-up compile finished")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+@app.after_serving
+async def close_http_client():
+    """Close pooled upstream API connections on shutdown"""
+    await CLIENT.aclose()
+
+
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint"""
     return jsonify({'status': 'healthy'}), 200
 
 
+# Load balancer health checks are answered before Quart's routing with a prebuilt response
+HEALTH_BODY = b'{"status":"healthy"}'
+HEALTH_HEADERS = [
+    (b'content-type', b'application/json'),
+    (b'content-length', str(len(HEALTH_BODY)).encode())
+]
+quart_asgi_app = app.asgi_app
+
+
+async def health_shortcut(scope, receive, send):
+    """ASGI wrapper serving GET /health directly, everything else goes to Quart"""
+    if scope['type'] == 'http' and scope['path'] == '/health' and scope['method'] == 'GET':
+        await send({'type': 'http.response.start', 'status': 200, 'headers': HEALTH_HEADERS})
+        await send({'type': 'http.response.body', 'body': HEALTH_BODY})
+        return
+    await quart_asgi_app(scope, receive, send)
+
+
+app.asgi_app = health_shortcut
+
+
 
 @app.route('/generate', methods=['POST'])
-def generate_resume_from_api():
+async def generate_resume_from_api():
     """
     Generate resume PDF by fetching data from your API endpoints
     This will fetch data from:
@@ -95,7 +188,7 @@ def generate_resume_from_api():
         return jsonify({'error': 'Server configuration error'}), 500
 
     # Validate auth key from request
-    data = request.get_json() or {}
+    data = await request.get_json() or {}
     provided_key = data.get('auth_key', '')
     if provided_key != AUTH_KEY:
         logger.warning(f"Invalid auth key attempt from {request.remote_addr}")
@@ -104,46 +197,55 @@ def generate_resume_from_api():
     try:
         upload_to_gcs_flag = data.get('upload_to_gcs', False)
 
-        # Generate resume (will fetch from API automatically)
+        # Load resume data (will fetch from API automatically)
         resume = Resume()
+        await resume.load()
+
+        # Identical data compiles to the same PDF, so reuse a previous build if there is one
+        cache_key = pdf_cache_key(resume.data)
+        pdf_bytes = PDF_CACHE.get(cache_key)
+        if pdf_bytes is None:
+            # Each request compiles in its own temp directory
+            tmpdir = tempfile.mkdtemp(dir=TMP_ROOT)
+
+            try:
+                pdf_filename = await resume.create(output_filename='resume', tmpdir=tmpdir)
+                with open(os.path.join(tmpdir, pdf_filename), 'rb') as f:
+                    pdf_bytes = f.read()
+            finally:
+                # Cleanup temp directory once the PDF is in memory
+                if os.path.exists(tmpdir):
+                    shutil.rmtree(tmpdir, ignore_errors=True)
+
+            PDF_CACHE[cache_key] = pdf_bytes
+        else:
+            logger.info(f"Serving cached resume PDF {cache_key[:12]}")
+
+        # Upload to GCS if requested
+        if upload_to_gcs_flag:
+            if not GCS_BUCKET_NAME or not storage_client:
+                return jsonify({
+                    'success': False,
+                    'message': 'Resume generated but GCS upload failed (bucket not configured)'
+                }), 500
+
+            # Upload the in-memory PDF in the background, the response doesn't wait on GCS
+            queue_gcs_upload(pdf_bytes, DEFAULT_BLOB_NAME)
+
+            gcs_url = f"gs://{GCS_BUCKET_NAME}/{DEFAULT_BLOB_NAME}"
+            logger.info(f"Resume upload to GCS queued: {gcs_url}")
+            return jsonify({
+                'queued': True,
+                'message': 'Resume generated, upload to GCS queued',
+                'gcs_url': gcs_url
+            }), 200
 
-        # Change to temp directory for PDF generation
-        original_cwd = os.getcwd()
-        tmpdir = tempfile.mkdtemp()
-
-        try:
-            os.chdir(tmpdir)
-            pdf_filename = resume.create(output_filename='resume')
-            pdf_path = os.path.join(tmpdir, pdf_filename)
-
-            # Upload to GCS if requested
-            if upload_to_gcs_flag:
-                gcs_url = upload_to_gcs(pdf_path)  # Use timestamped name
-                if gcs_url:
-                    logger.info(f"Resume uploaded to GCS: {gcs_url}")
-                    return jsonify({
-                        'success': True,
-                        'message': 'Resume generated and uploaded to GCS',
-                        'gcs_url': gcs_url
-                    }), 200
-                else:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Resume generated but GCS upload failed (bucket not configured)'
-                    }), 500
-
-            # Send the PDF file - Flask will handle cleanup after sending
-            return send_file(
-                pdf_path,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name='resume.pdf'
-            )
-        finally:
-            os.chdir(original_cwd)
-            # Cleanup temp directory after response is sent
-            if os.path.exists(tmpdir):
-                shutil.rmtree(tmpdir, ignore_errors=True)
+        return await send_file(
+            io.BytesIO(pdf_bytes),
+            mimetype='application/pdf',
+            as_attachment=True,
+            attachment_filename='resume.pdf'
+        )
 
     except Exception as e:
         logger.error(f"Error generating resume from API: {str(e)}")
@@ -151,5 +253,6 @@ def generate_resume_from_api():
 
 
 if __name__ == '__main__':
+    # Local development only, production runs under hypercorn (see Dockerfile)
     port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_ENV') == 'development')
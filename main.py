@@ -1,27 +1,64 @@
+import asyncio
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from operator import itemgetter
 
-import requests
-from typing import Dict, Any, List, Optional
+import httpx
+from cachetools import TTLCache
+from typing import Dict, Any, List, Optional, Tuple
 from pylatex import Document, NoEscape
 
+# Shared client so keep-alive connections and TLS sessions are reused across fetches;
+# HTTP/2 multiplexes concurrent fetches over a single connection
+CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=10,
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=8)
+)
 
-def fetch(url: str) -> Dict[str, Any]:
+# Parsed API responses keyed by URL; the upstream data rarely changes within minutes
+FETCH_CACHE: TTLCache = TTLCache(maxsize=16, ttl=300)
+
+# Last ETag and parsed body per URL, revalidated with If-None-Match once the TTL expires
+ETAG_CACHE: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+
+async def fetch(url: str) -> Dict[str, Any]:
     """Make HTTP request and return parsed response as dict."""
+    cached = FETCH_CACHE.get(url)
+    if cached is not None:
+        return cached
+
     try:
         print(f"fetching data from {url}...")
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.Timeout:
+        etag, cached_body = ETAG_CACHE.get(url, (None, None))
+        headers = {'If-None-Match': etag} if etag else {}
+        response = await CLIENT.get(url, headers=headers)
+
+        if response.status_code == 304:
+            # Unchanged upstream, reuse the body we already have
+            data = cached_body
+        else:
+            response.raise_for_status()
+            data = response.json()
+            if response.headers.get('ETag'):
+                ETAG_CACHE[url] = (response.headers['ETag'], data)
+
+        # Only successful responses are cached, failures are retried on the next call
+        FETCH_CACHE[url] = data
+        return data
+    except httpx.TimeoutException:
         print(f"Request timed out: {url}")
         return {}
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print(f"Connection error: {url}")
         return {}
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         print(f"HTTP error {e.response.status_code}: {url}")
         return {}
-    except requests.exceptions.JSONDecodeError:
+    except json.JSONDecodeError:
         print(f"Invalid JSON response: {url}")
         return {}
     except Exception as e:
@@ -29,56 +66,130 @@ def fetch(url: str) -> Dict[str, Any]:
         return {}
 
 
+# Document setup shared by every resume, built once at import
+GEOMETRY_OPTIONS = {
+    "left": "0.75in",
+    "right": "0.75in",
+    "top": "0.5in",
+    "bottom": "0.75in"
+}
+
+# Required packages
+PACKAGES = (
+    NoEscape(r'\usepackage{enumitem}'),
+    NoEscape(r'\usepackage{hyperref}'),
+    NoEscape(r'\usepackage{amsmath}'),
+    NoEscape(r'\usepackage[svgnames]{xcolor}'),
+    NoEscape(r'\usepackage{sectsty}'),
+)
+
+# Color definitions and settings
+PREAMBLE = (
+    NoEscape(r'\definecolor{LinkBlue}{RGB}{48,92,199}'),
+    NoEscape(r'\definecolor{MainBlue}{RGB}{16,82,197}'),
+    NoEscape(r'\hypersetup{colorlinks = true, urlcolor=LinkBlue}'),
+    NoEscape(r'\sectionfont{\color{MainBlue}}'),
+    NoEscape(r'\linespread{0.90}'),
+    NoEscape(r'\pagestyle{empty}'),
+    # No labels or references to resolve, so skip writing the .aux file
+    NoEscape(r'\nofiles'),
+)
+
+# Separator pylatex puts between appended items, so joined sections dump the same LaTeX
+LINE_SEPARATOR = '%\n'
+
+# Fixed parts of the resume, joined once at import
+NAME_HEADER = LINE_SEPARATOR.join([
+    r'\begin{center}',
+    r'\textbf{\Huge Sai Yerni Akhil Madabattula}',
+    r'\end{center}',
+    r'\vspace{2mm}'
+])
+
+WORK_EX_HEADING = LINE_SEPARATOR.join([
+    r'\section*{Work Experience}',
+    r'{\color{MainBlue}\hrule height 0.5mm}',
+    r'\vspace{3mm}'
+])
+
+SKILLS_HEADING = LINE_SEPARATOR.join([
+    r'\section*{Skills}',
+    r'{\color{MainBlue}\hrule height 0.5mm}',
+    r'\vspace{3mm}'
+])
+
+EDUCATION_BLOCK = NoEscape(LINE_SEPARATOR.join([
+    # Section header
+    r'\section*{Education}',
+    r'{\color{MainBlue}\hrule height 0.5mm}',
+    r'\vspace{3mm}',
+
+    # University of Wisconsin
+    r'\noindent',
+    r'\textbf{University of Wisconsin,} United States \hfill Jan 2023 - Aug 2024\\',
+    r'M.S. Computer Science \hfill GPA: 3.8\\',
+    r'Relevant Courses: Machine Learning, Network Security, Programming Language Concepts, Concurrent Programming, Natural Language Processing, Web Development\\',
+    r'\vspace{3mm}',
+
+    # Sathyabama Institute
+    r'\noindent',
+    r'\textbf{Sathyabama Institute of Science and Technology,} Chennai, India \hfill July 2016 - May 2020 \\',
+    r'B.E. Computer Science and Engineering \hfill GPA: 8.45\\',
+    r'Courses: Data Structures, Advanced Data Structures, Machine Learning, DBMS, Operating Systems, Responsive Web Design\\'
+]))
+
+# CPUs this process may run on; like nproc, this respects affinity and cpusets
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+
+# Number of server worker processes sharing those CPUs (set in the Dockerfile)
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+
+# LaTeX compiles run on their own pool holding this worker's share of the CPUs, so
+# bursts queue up instead of oversubscribing the CPUs with concurrent engine processes
+LATEX_POOL = ThreadPoolExecutor(
+    max_workers=max(1, CPU_COUNT // WEB_CONCURRENCY),
+    thread_name_prefix='latex'
+)
+
+# Upper bound in seconds for one LaTeX compile, a stuck engine is killed after this
+LATEX_TIMEOUT = 90
+
+# Precompiled pdflatex format holding the preamble above, built in the Dockerfile
+LATEX_FORMAT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preamble')
+
+# Whether compiles load the format; cleared by warm_up() if it can't build a resume
+USE_LATEX_FORMAT = os.path.exists(f'{LATEX_FORMAT}.fmt')
+
+
 class Resume:
     doc: Optional[Document] = None
     data: Dict[str, Any] = {}
 
     def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
-        # Document setup with custom geometry and packages
-        geometry_options = {
-            "left": "0.75in",
-            "right": "0.75in",
-            "top": "0.5in",
-            "bottom": "0.75in"
-        }
-        self.doc = Document(geometry_options=geometry_options)
-
-        # Add required packages
-        self.doc.packages.append(NoEscape(r'\usepackage{enumitem}'))
-        self.doc.packages.append(NoEscape(r'\usepackage{hyperref}'))
-        self.doc.packages.append(NoEscape(r'\usepackage{amsmath}'))
-        self.doc.packages.append(NoEscape(r'\usepackage[svgnames]{xcolor}'))
-        self.doc.packages.append(NoEscape(r'\usepackage{sectsty}'))
-
-        # Add color definitions and settings
-        self.doc.preamble.append(NoEscape(r'\definecolor{LinkBlue}{RGB}{48,92,199}'))
-        self.doc.preamble.append(NoEscape(r'\definecolor{MainBlue}{RGB}{16,82,197}'))
-        self.doc.preamble.append(NoEscape(r'\hypersetup{colorlinks = true, urlcolor=LinkBlue}'))
-        self.doc.preamble.append(NoEscape(r'\sectionfont{\color{MainBlue}}'))
-        self.doc.preamble.append(NoEscape(r'\linespread{0.90}'))
-        self.doc.preamble.append(NoEscape(r'\pagestyle{empty}'))
-
-        # Use provided data or fetch from API
+        # Document setup with custom geometry and the shared preamble
+        self.doc = Document(geometry_options=GEOMETRY_OPTIONS)
+        self.doc.packages.update(PACKAGES)
+        self.doc.preamble.extend(PREAMBLE)
+
+        # Use provided data, otherwise it is fetched from the API in create()
         if data:
             self.data = data
-        else:
-            # fetch data from API
-            data = fetch("https://saiyerniakhil.in/api/data.json")
-            personal_info, social_links, work_ex, skills = itemgetter('personalInfo', 'socialLinks','workExperience', 'skills')(data)
-            self.data = {
-                'workEx': work_ex if work_ex else [],
-                'socialLinks': social_links if social_links else {},
-                'personalInfo': personal_info if personal_info else {},
-                'skills': skills if skills else {}
-            }
+
+    async def load(self) -> None:
+        """Fetch resume data from the API"""
+        data = await fetch("https://saiyerniakhil.in/api/data.json")
+        personal_info, social_links, work_ex, skills = itemgetter('personalInfo', 'socialLinks','workExperience', 'skills')(data)
+        self.data = {
+            'workEx': work_ex if work_ex else [],
+            'socialLinks': social_links if social_links else {},
+            'personalInfo': personal_info if personal_info else {},
+            'skills': skills if skills else {}
+        }
 
     def createHeader(self) -> None:
         """Create header with name and social links"""
         # Name
-        self.doc.append(NoEscape(r'\begin{center}'))
-        self.doc.append(NoEscape(r'\textbf{\Huge Sai Yerni Akhil Madabattula}'))
-        self.doc.append(NoEscape(r'\end{center}'))
-        self.doc.append(NoEscape(r'\vspace{2mm}'))
+        lines = [NAME_HEADER]
 
         # Social links
         social = self.data.get('socialLinks', {})
@@ -96,16 +207,16 @@ class Resume:
             links.append(social['phone'])
 
         if links:
-            self.doc.append(NoEscape(r'\begin{center}'))
-            self.doc.append(NoEscape('\n\\text{\\textbar}\n'.join(links)))
-            self.doc.append(NoEscape(r'\end{center}'))
+            lines.append(r'\begin{center}')
+            lines.append('\n\\text{\\textbar}\n'.join(links))
+            lines.append(r'\end{center}')
+
+        self.doc.append(NoEscape(LINE_SEPARATOR.join(lines)))
 
     def createWorkExSection(self) -> None:
         """Create work experience section with all jobs"""
         # Section header
-        self.doc.append(NoEscape(r'\section*{Work Experience}'))
-        self.doc.append(NoEscape(r'{\color{MainBlue}\hrule height 0.5mm}'))
-        self.doc.append(NoEscape(r'\vspace{3mm}'))
+        lines = [WORK_EX_HEADING]
 
         # Get work experience from self.data and ensure it's a list
         work_ex = self.data.get('workEx', [])
@@ -119,36 +230,35 @@ class Resume:
             company = job.get('company', '')
             location = job.get('location', '')
 
-            self.doc.append(NoEscape(r'\noindent'))
-            self.doc.append(NoEscape(f'\\textbf{{{role}}} \\hfill {period} \\\\'))
-            self.doc.append(NoEscape(f'\\text{{{company}}} \\hfill {location}'))
+            lines.append(r'\noindent')
+            lines.append(f'\\textbf{{{role}}} \\hfill {period} \\\\')
+            lines.append(f'\\text{{{company}}} \\hfill {location}')
 
             # Description bullets
             descriptions = job.get('description', [])
             if descriptions:
-                self.doc.append(NoEscape(r'\begin{itemize}[leftmargin=*]'))
-                self.doc.append(NoEscape(r'\setlength{\itemsep}{0.02em}'))
-                for desc in descriptions:
-                    self.doc.append(NoEscape(f'\\item {desc}'))
-                self.doc.append(NoEscape(r'\end{itemize}'))
+                lines.append(r'\begin{itemize}[leftmargin=*]')
+                lines.append(r'\setlength{\itemsep}{0.02em}')
+                lines.extend(f'\\item {desc}' for desc in descriptions)
+                lines.append(r'\end{itemize}')
 
             # Add spacing between jobs (except for last one)
             if idx < len(work_ex) - 1:
-                self.doc.append(NoEscape(r'\vspace{2mm}'))
+                lines.append(r'\vspace{2mm}')
+
+        self.doc.append(NoEscape(LINE_SEPARATOR.join(lines)))
 
     def createSkills(self) -> None:
         """Create Skills Section"""
         # Section header
-        self.doc.append(NoEscape(r'\section*{Skills}'))
-        self.doc.append(NoEscape(r'{\color{MainBlue}\hrule height 0.5mm}'))
-        self.doc.append(NoEscape(r'\vspace{3mm}'))
+        lines = [SKILLS_HEADING]
 
         # Get skills from self.data
         skills = self.data.get('skills', [])
 
         if skills:
-            self.doc.append(NoEscape(r'\begin{itemize}[leftmargin=*]'))
-            self.doc.append(NoEscape(r'\setlength{\itemsep}{0.02em}'))
+            lines.append(r'\begin{itemize}[leftmargin=*]')
+            lines.append(r'\setlength{\itemsep}{0.02em}')
 
             for skill in skills:
                 skill_type = skill.get('type', '')
@@ -157,32 +267,52 @@ class Resume:
                 if skill_type and values:
                     # Join values with comma and space
                     values_str = ', '.join(values)
-                    self.doc.append(NoEscape(f'\\item \\textbf{{{skill_type}:}} {values_str}'))
+                    lines.append(f'\\item \\textbf{{{skill_type}:}} {values_str}')
 
-            self.doc.append(NoEscape(r'\end{itemize}'))
+            lines.append(r'\end{itemize}')
+
+        self.doc.append(NoEscape(LINE_SEPARATOR.join(lines)))
 
     def createEducation(self) -> None:
         """Create Education Section"""
-        # Section header
-        self.doc.append(NoEscape(r'\section*{Education}'))
-        self.doc.append(NoEscape(r'{\color{MainBlue}\hrule height 0.5mm}'))
-        self.doc.append(NoEscape(r'\vspace{3mm}'))
-
-        # University of Wisconsin
-        self.doc.append(NoEscape(r'\noindent'))
-        self.doc.append(NoEscape(r'\textbf{University of Wisconsin,} United States \hfill Jan 2023 - Aug 2024\\'))
-        self.doc.append(NoEscape(r'M.S. Computer Science \hfill GPA: 3.8\\'))
-        self.doc.append(NoEscape(r'Relevant Courses: Machine Learning, Network Security, Programming Language Concepts, Concurrent Programming, Natural Language Processing, Web Development\\'))
-        self.doc.append(NoEscape(r'\vspace{3mm}'))
-
-        # Sathyabama Institute
-        self.doc.append(NoEscape(r'\noindent'))
-        self.doc.append(NoEscape(r'\textbf{Sathyabama Institute of Science and Technology,} Chennai, India \hfill July 2016 - May 2020 \\'))
-        self.doc.append(NoEscape(r'B.E. Computer Science and Engineering \hfill GPA: 8.45\\'))
-        self.doc.append(NoEscape(r'Courses: Data Structures, Advanced Data Structures, Machine Learning, DBMS, Operating Systems, Responsive Web Design\\'))
-
-    def create(self, output_filename: str = "resume") -> str:
+        self.doc.append(EDUCATION_BLOCK)
+
+    def generatePdf(self, output_filename: str, tmpdir: str) -> None:
+        """Compile the document with pdflatex, loading the precompiled preamble format if available"""
+        self.doc.generate_tex(os.path.join(tmpdir, output_filename))
+
+        # A single pass is enough, the resume has no references or TOC to resolve
+        command = ['pdflatex', '-interaction=nonstopmode', '-halt-on-error']
+        if USE_LATEX_FORMAT:
+            # Packages are already loaded in the format, pdflatex skips the preamble
+            command.append(f'-fmt={LATEX_FORMAT}')
+        command.append(f'{output_filename}.tex')
+
+        try:
+            # Run inside tmpdir via cwd, the process working directory is never changed
+            subprocess.run(
+                command,
+                cwd=tmpdir,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=LATEX_TIMEOUT
+            )
+        except subprocess.CalledProcessError as e:
+            print(e.output.decode())
+            raise
+        except subprocess.TimeoutExpired as e:
+            # subprocess.run has already killed the engine, free the pool slot and fail the request
+            if e.output:
+                print(e.output.decode())
+            raise RuntimeError(f"{command[0]} timed out after {LATEX_TIMEOUT} seconds") from e
+
+    async def create(self, output_filename: str = "resume", tmpdir: str = os.curdir) -> str:
         """Generate the PDF resume"""
+        # Fetch data from API if none was provided
+        if not self.data:
+            await self.load()
+
         # Create header
         self.createHeader()
 
@@ -197,11 +327,31 @@ class Resume:
         # Create education section
         self.createEducation()
 
-        # Generate PDF
-        self.doc.generate_pdf(output_filename, clean_tex=False)
+        # Generate PDF on the LaTeX pool so the event loop keeps serving other requests
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(LATEX_POOL, self.generatePdf, output_filename, tmpdir)
         return f"{output_filename}.pdf"
 
 
+async def warm_up(tmpdir: str) -> None:
+    """
+    Compile a throwaway resume so the first request finds the TeX tree in the page cache
+
+    If it fails with the precompiled preamble format, the format is dropped for the
+    rest of the process and the compile is retried; any other failure is raised.
+    """
+    global USE_LATEX_FORMAT
+
+    try:
+        await Resume(data={'socialLinks': {}}).create(output_filename='warmup', tmpdir=tmpdir)
+    except Exception as e:
+        if not USE_LATEX_FORMAT:
+            raise
+        print(f"Warm-up compile with the preamble format failed, compiling without it: {e}")
+        USE_LATEX_FORMAT = False
+        await Resume(data={'socialLinks': {}}).create(output_filename='warmup', tmpdir=tmpdir)
+
+
 if __name__ == "__main__":
     # Test with sample data
     sample_data = {
@@ -245,4 +395,4 @@ if __name__ == "__main__":
     }
 
     r = Resume(data=sample_data)
-    r.create()
\ No newline at end of file
+    asyncio.run(r.create())
\ No newline at end of file